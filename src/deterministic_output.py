@@ -25,7 +25,7 @@ Formatting rules:
 
 from __future__ import annotations
 
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 #list to keep track of if more is better or worse for the metric
 # (metric, higher_is_better)
@@ -41,6 +41,8 @@ METRICS: List[Tuple[str, bool]] = [
     ("sleepTimeSeconds", True),
 ]
 
+METRIC_NAMES: List[str] = [m for m, _ in METRICS]
+
 SECONDS_METRICS = {
     "awakeSleepSeconds",
     "deepSleepSeconds",
@@ -60,6 +62,13 @@ LABELS = {
     "sleepTimeSeconds": "total sleep time",
 }
 
+METRIC_LABELS: List[str] = [LABELS.get(m, m) for m in METRIC_NAMES]
+
+# The missing-value line depends only on the metric, so build it once
+MISSING_LINES: Dict[str, str] = {
+    m: f"Your {label} is missing in the most recent record." for m, label in zip(METRIC_NAMES, METRIC_LABELS)
+}
+
 
 def safe_float(v) -> Optional[float]:
     if v is None:
@@ -101,25 +110,35 @@ def sec_to_hr_min_round_minute(seconds: float) -> str:
     return f"{h}h{m}m"
 
 
+def fmt_whole(value: float) -> str:
+    return str(int(round(value)))
+
+
+def fmt_tenth(value: float) -> str:
+    return f"{round_1(value):.1f}"
+
+
+# metric -> formatter, built once so each call is a dict lookup instead of an if/elif chain
+_CURRENT_FORMATTERS: Dict[str, Callable[[float], str]] = {m: sec_to_min_sec_round_minute for m in SECONDS_METRICS}
+_CURRENT_FORMATTERS["sleepTimeSeconds"] = sec_to_hr_min_round_minute
+
+_AVG_FORMATTERS: Dict[str, Callable[[float], str]] = {m: sec_to_min_sec for m in SECONDS_METRICS}
+_AVG_FORMATTERS["sleepTimeSeconds"] = sec_to_hr_min
+
+
 def fmt_current_value(metric: str, value: float) -> str:
     """Current values: time -> nearest minute; others -> nearest whole number."""
-    if metric == "sleepTimeSeconds":
-        return sec_to_hr_min_round_minute(value)
-    if metric in SECONDS_METRICS:
-        return sec_to_min_sec_round_minute(value)
-    return str(int(round(value)))
+    return _CURRENT_FORMATTERS.get(metric, fmt_whole)(value)
 
 
 def fmt_avg_value(metric: str, value: float) -> str:
     """Averages: time -> seconds format; non-time -> 0.1. TST average -> HhMm."""
-    if metric == "sleepTimeSeconds":
-        return sec_to_hr_min(value)
-    if metric in SECONDS_METRICS:
-        return sec_to_min_sec(value)
-    return f"{round_1(value):.1f}"
+    return _AVG_FORMATTERS.get(metric, fmt_tenth)(value)
 
 
 def compare(value: float, avg: float, higher_is_better: bool) -> str:
+    # Plain branches are faster here than a (sign, higher_is_better) table lookup,
+    # which pays for building and hashing a tuple on every call
     if abs(value - avg) < 1e-9:
         return "about the same as"
     if higher_is_better:
@@ -131,44 +150,47 @@ def metric_label(metric: str) -> str:
     return LABELS.get(metric, metric)
 
 
-def avg_metric(records: List[Dict], metric: str) -> Optional[float]:
-    vals: List[float] = []
+def avg_metrics(records: List[Dict], metrics: List[str]) -> Dict[str, Optional[float]]:
+    """Average every metric in one pass over records; None where a metric has no values."""
+    sums = dict.fromkeys(metrics, 0.0)
+    counts = dict.fromkeys(metrics, 0)
     for r in records:
-        v = safe_float(r.get(metric))
-        if v is not None:
-            vals.append(v)
-    if not vals:
-        return None
-    return sum(vals) / len(vals)
-
-#the main function that is called for this project
-def build_sleep_summary_text(current_sleep: Dict, prior_week_sleeps: List[Dict]) -> str:
-    """Build the multi-line text summary comparing current sleep to prior-week average."""
-    lines: List[str] = []
-
-    for metric, higher_is_better in METRICS:
+        for metric in metrics:
+            v = safe_float(r.get(metric))
+            if v is not None:
+                sums[metric] += v
+                counts[metric] += 1
+    return {m: (sums[m] / counts[m] if counts[m] else None) for m in metrics}
+
+def _summary_lines(current_sleep: Dict, prior_week_sleeps: List[Dict]) -> Iterator[str]:
+    """Yield the summary lines one at a time so the caller can join them directly."""
+    avgs = avg_metrics(prior_week_sleeps, METRIC_NAMES)
+
+    for (metric, higher_is_better), label in zip(METRICS, METRIC_LABELS):
         v = safe_float(current_sleep.get(metric))
         if v is None:
-            lines.append(f"Your {metric_label(metric)} is missing in the most recent record.")
+            yield MISSING_LINES[metric]
             continue
 
-        avg = avg_metric(prior_week_sleeps, metric)
+        avg = avgs[metric]
         if avg is None:
-            lines.append(
-                f"Your {metric_label(metric)} was {fmt_current_value(metric, v)}. "
+            yield (
+                f"Your {label} was {fmt_current_value(metric, v)}. "
                 f"(Not enough prior-week data to compare.)"
             )
             continue
 
         verdict = compare(v, avg, higher_is_better)
-        lines.append(
-            f"Your {metric_label(metric)} was {fmt_current_value(metric, v)}; "
+        yield (
+            f"Your {label} was {fmt_current_value(metric, v)}; "
             f"this is {verdict} the previous week average of {fmt_avg_value(metric, avg)}."
         )
-        
+
     #including a question to ellicit a response
-    lines.append(
-        f"Any thoughts on why your sleep was like this?"
-    )
+    yield "Any thoughts on why your sleep was like this?"
+
 
-    return "\n".join(lines)
+#the main function that is called for this project
+def build_sleep_summary_text(current_sleep: Dict, prior_week_sleeps: List[Dict]) -> str:
+    """Build the multi-line text summary comparing current sleep to prior-week average."""
+    return "\n".join(_summary_lines(current_sleep, prior_week_sleeps))
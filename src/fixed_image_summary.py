@@ -26,7 +26,6 @@ Influx env vars are the same as fixed_message.py:
 
 from __future__ import annotations
 
-import json
 import os
 from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
@@ -37,6 +36,7 @@ from sleep_report.influx_fetch import (
     connect_influx,
     fetch_sleep_intraday_range,
     fetch_sleep_summary_last_days,
+    fetch_sleep_summary_since,
     fetch_sleep_summary_time_range,
 )
 from sleep_report.selectors import (
@@ -45,27 +45,35 @@ from sleep_report.selectors import (
     select_current,
 )
 from sleep_report.stages import build_stage_sessions
+from sleep_report.state_store import json_loads, load_state, save_state
 from sleep_report.time_utils import parse_time_utc
 
 from image_summary import METRICS, render_sleep_report_png
 
 
+METRIC_NAMES = [m for (m, _hib) in METRICS]
+
 # Separate state file so text and image sends don't block each other
 STATE_PATH = Path("/app/data/last_sleep_image_sent_key.json")
 
+# In-process cache of the rolling SleepSummary window for the default "latest" mode.
+# The scheduler calls run_once every few minutes and consecutive windows overlap almost
+# entirely, so only rows at/after the newest cached time are re-queried; a full refetch
+# happens every SUMMARY_CACHE_TTL in case older rows were rewritten.
+SUMMARY_CACHE_TTL = timedelta(hours=6)
+_cached_summaries: list[dict] = []
+_cached_summary_days: int | None = None
+_cached_summaries_at: datetime | None = None
+
 
 def load_last_sent_key() -> str | None:
     """Return the last sent key from STATE_PATH, or None if missing/unreadable."""
-    try:
-        return json.loads(STATE_PATH.read_text()).get("last_sent_key")
-    except Exception:
-        return None
+    return (load_state(STATE_PATH) or {}).get("last_sent_key")
 
 
 def save_last_sent_key(key: str) -> None:
-    """Persist the last sent key to STATE_PATH."""
-    STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
-    STATE_PATH.write_text(json.dumps({"last_sent_key": key}))
+    """Persist the last sent key to STATE_PATH (see sleep_report.state_store)."""
+    save_state(STATE_PATH, {"last_sent_key": key})
 
 
 def repo_root_from_src_file(src_file: Path) -> Path:
@@ -101,7 +109,6 @@ def telegram_send_photo(image_path: Path, caption: str = "") -> bool:
             f"{value}\r\n"
         ).encode("utf-8")
 
-    file_bytes = image_path.read_bytes()
     mime = mimetypes.guess_type(str(image_path))[0] or "image/png"
 
     file_header = (
@@ -112,27 +119,30 @@ def telegram_send_photo(image_path: Path, caption: str = "") -> bool:
 
     end = f"--{boundary}--\r\n".encode("utf-8")
 
-    body = b"".join(
-        [
-            part("chat_id", str(chat_id)),
-            part("caption", caption),
-            file_header,
-            file_bytes,
-            b"\r\n",
-            end,
-        ]
-    )
+    head = b"".join([part("chat_id", str(chat_id)), part("caption", caption), file_header])
+    tail = b"\r\n" + end
+    content_length = len(head) + image_path.stat().st_size + len(tail)
+
+    def body_chunks():
+        # Stream the PNG from disk in 64 KiB reads instead of holding it (and a joined copy) in memory
+        yield head
+        with image_path.open("rb") as fh:
+            for chunk in iter(lambda: fh.read(64 * 1024), b""):
+                yield chunk
+        yield tail
 
-    req = request.Request(url, data=body, method="POST")
+    # urllib sends iterable bodies chunk by chunk as long as Content-Length is set
+    req = request.Request(url, data=body_chunks(), method="POST")
     req.add_header("Content-Type", f"multipart/form-data; boundary={boundary}")
-    req.add_header("Content-Length", str(len(body)))
+    req.add_header("Content-Length", str(content_length))
 
     try:
         with request.urlopen(req, timeout=30) as resp:
-            payload = resp.read().decode("utf-8", errors="replace")
+            payload = resp.read()
 
+        # Parse the raw bytes; only decode to text for the error log below
         try:
-            data = json.loads(payload)
+            data = json_loads(payload)
         except Exception:
             data = {}
 
@@ -140,16 +150,52 @@ def telegram_send_photo(image_path: Path, caption: str = "") -> bool:
         if ok:
             print("Sent Telegram image.")
         else:
-            print("Telegram sendPhoto response (not ok):", payload[:500])
+            print("Telegram sendPhoto response (not ok):", payload[:500].decode("utf-8", errors="replace"))
         return ok
     except Exception as e:
         print("Telegram sendPhoto failed:", repr(e))
         return False
 
 
-def _select_summary_for_day(candidates: list[dict], day: date, tz: ZoneInfo) -> dict:
+def _fetch_recent_summaries(client, summary_days: int) -> list[dict]:
+    """Return SleepSummary rows for the last summary_days, reusing the in-process cache when fresh."""
+    global _cached_summaries, _cached_summary_days, _cached_summaries_at
+
+    now = datetime.now(timezone.utc)
+    fresh = (
+        _cached_summaries
+        and _cached_summary_days == summary_days
+        and _cached_summaries_at is not None
+        and now - _cached_summaries_at < SUMMARY_CACHE_TTL
+    )
+    if not fresh:
+        _cached_summaries = fetch_sleep_summary_last_days(client, days=summary_days)
+        _cached_summary_days = summary_days
+        _cached_summaries_at = now
+        return _cached_summaries
+
+    # Re-fetch from the newest cached row (inclusive) so an updated latest record replaces the old
+    # copy; no upper bound, so rows stamped ahead of the local clock are still picked up
+    last_time = parse_time_utc(_cached_summaries[-1]["time"])
+    delta = fetch_sleep_summary_since(client, last_time)
+
+    cutoff = now - timedelta(days=int(summary_days))
+    kept = [r for r in _cached_summaries if cutoff < parse_time_utc(r["time"]) < last_time]
+    _cached_summaries = kept + delta
+    return _cached_summaries
+
+
+def _summary_day_key(summary: dict, tz: ZoneInfo) -> str:
+    """Use calendarDate if present; else ISO date from time (local)."""
+    if summary.get("calendarDate"):
+        return str(summary["calendarDate"])[:10]
+    return parse_time_utc(summary["time"]).astimezone(tz).date().isoformat()
+
+
+def _select_summary_for_day(candidates: list[dict], day: date, tz: ZoneInfo) -> tuple[dict, str]:
     """
     Choose a SleepSummary record matching a LOCAL day.
+    Returns (record, day_key); the record is returned as-is since rendering only reads it.
 
     Preference:
       1) calendarDate == YYYY-MM-DD (if present)
@@ -158,23 +204,29 @@ def _select_summary_for_day(candidates: list[dict], day: date, tz: ZoneInfo) ->
     day_str = day.isoformat()
 
     matches = [c for c in candidates if str(c.get("calendarDate") or "").strip() == day_str]
-    if not matches:
-        matches = []
-        for c in candidates:
-            t = c.get("time")
-            if not t:
-                continue
-            try:
-                if parse_time_utc(t).astimezone(tz).date() == day:
-                    matches.append(c)
-            except Exception:
-                continue
+    if matches:
+        # calendarDate matched, so the match key is already the day key
+        return max(matches, key=lambda r: parse_time_utc(r["time"])), day_str
+
+    # Convert the local day to a UTC window once rather than converting every candidate to local time
+    day_start = datetime(day.year, day.month, day.day, tzinfo=tz)
+    start_utc = day_start.astimezone(timezone.utc)
+    end_utc = (day_start + timedelta(days=1)).astimezone(timezone.utc)
+    for c in candidates:
+        t = c.get("time")
+        if not t:
+            continue
+        try:
+            if start_utc <= parse_time_utc(t) < end_utc:
+                matches.append(c)
+        except Exception:
+            continue
 
     if not matches:
         raise SystemExit(f"No SleepSummary record found for local day {day_str} in {tz.key}.")
 
-    matches.sort(key=lambda r: parse_time_utc(r["time"]))
-    return dict(matches[-1])
+    current = max(matches, key=lambda r: parse_time_utc(r["time"]))
+    return current, _summary_day_key(current, tz)
 
 
 def run_once(
@@ -206,7 +258,7 @@ def run_once(
         end_utc = (end_local + timedelta(hours=18)).astimezone(timezone.utc)
 
         candidates = fetch_sleep_summary_time_range(client, start_utc, end_utc)
-        current = _select_summary_for_day(candidates, target_day, tz)
+        current, day_key = _select_summary_for_day(candidates, target_day, tz)
 
         current_time = parse_time_utc(current["time"])
 
@@ -218,10 +270,11 @@ def run_once(
             current_time + timedelta(seconds=1),
         )
     else:
-        summaries = fetch_sleep_summary_last_days(client, days=summary_days)
+        summaries = _fetch_recent_summaries(client, summary_days)
         current = select_current(summaries)
         if current is None:
             raise SystemExit(f"No SleepSummary data found in the last {summary_days} days.")
+        day_key = _summary_day_key(current, tz)
 
     sleep_key = str(current.get("calendarDate") or current.get("time") or "").strip()
     if not sleep_key:
@@ -236,9 +289,9 @@ def run_once(
     else:
         print("Day override active: ignoring last_sent_key skip check.")
 
-    # Compute baselines (exclude current so it doesn't affect itself)
-    metric_names = [m for (m, _hib) in METRICS]
-    baselines = compute_metric_baselines(summaries, metric_names, exclude_summary=current)
+    # Compute baselines (exclude current so it doesn't affect itself). This runs after the
+    # skip check, so in the scheduler it happens once per new night, not once per tick.
+    baselines = compute_metric_baselines(summaries, METRIC_NAMES, exclude_summary=current)
 
     # Fetch intraday points for a window that should contain the sleep session
     start_utc, end_utc = compute_intraday_fetch_window(current)
@@ -251,12 +304,6 @@ def run_once(
     out_dir = root / "exports" / "summary_screenshots"
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    # Use calendarDate if present; else ISO date from time (local)
-    if current.get("calendarDate"):
-        day_key = str(current["calendarDate"])[:10]
-    else:
-        day_key = parse_time_utc(current["time"]).astimezone(tz).date().isoformat()
-
     out_path = out_dir / f"sleep_report_{day_key}.png"
 
     #the main function call to create the image contained in image_summary.py
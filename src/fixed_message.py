@@ -9,10 +9,8 @@ then sends it via Telegram.
 
 from __future__ import annotations
 
-import os
-from datetime import datetime, timedelta, timezone
+from datetime import timedelta
 from typing import Dict, List, Optional, Tuple
-import json
 from pathlib import Path
 
 from influxdb import InfluxDBClient
@@ -24,81 +22,52 @@ except Exception:
     pass
 
 from deterministic_output import build_sleep_summary_text
+from sleep_report.influx_fetch import connect_influx
+from sleep_report.state_store import load_state, save_state
+from sleep_report.time_utils import parse_time_utc
 from telegram_client import send_message
 
-INFLUXDB_HOST = os.getenv("INFLUXDB_HOST", "localhost")
-INFLUXDB_PORT = int(os.getenv("INFLUXDB_PORT", "8086"))
-INFLUXDB_DATABASE = os.getenv("INFLUXDB_DATABASE", "GarminStats")
-INFLUXDB_USERNAME = os.getenv("INFLUXDB_USERNAME", "") or None
-INFLUXDB_PASSWORD = os.getenv("INFLUXDB_PASSWORD", "") or None
-INFLUXDB_SSL = os.getenv("INFLUXDB_SSL", "false").lower() in ("1", "true", "yes", "y")
 STATE_PATH = Path("/app/data/last_sleep_sent_key.json")
 
 
-def parse_time_utc(t: str) -> datetime:
-    dt = datetime.fromisoformat(t.replace("Z", "+00:00"))
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
-    return dt.astimezone(timezone.utc)
-
-
-def connect_influx() -> InfluxDBClient:
-    client = InfluxDBClient(
-        host=INFLUXDB_HOST,
-        port=INFLUXDB_PORT,
-        username=INFLUXDB_USERNAME,
-        password=INFLUXDB_PASSWORD,
-        ssl=INFLUXDB_SSL,
-        verify_ssl=INFLUXDB_SSL,
-        timeout=30,
-        retries=3,
-    )
-    client.switch_database(INFLUXDB_DATABASE)
-    return client
-
 def load_last_sent_key() -> str | None:
-    try:
-        return json.loads(STATE_PATH.read_text()).get("last_sent_key")
-    except Exception:
-        return None
-
-def save_last_sent_key(key: str) -> None:
-    STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
-    STATE_PATH.write_text(json.dumps({"last_sent_key": key}))
-
-def fetch_sleep_summary_last_days(client: InfluxDBClient, days: int = 8) -> List[Dict]:
-    q = f'SELECT * FROM "SleepSummary" WHERE time > now() - {days}d ORDER BY time ASC'
-    result = client.query(q)
-    return list(result.get_points())
+    return (load_state(STATE_PATH) or {}).get("last_sent_key")
 
 
-def select_current_and_prior_week(points: List[Dict]) -> Optional[Tuple[Dict, List[Dict]]]:
-    dated: List[Tuple[datetime, Dict]] = []
-    for p in points:
-        t = p.get("time")
-        if isinstance(t, str):
-            dated.append((parse_time_utc(t), p))
-
-    if not dated:
+def save_last_sent_key(key: str) -> None:
+    save_state(STATE_PATH, {"last_sent_key": key})
+
+def fetch_current_and_prior_week(client: InfluxDBClient, days: int = 8) -> Optional[Tuple[Dict, List[Dict]]]:
+    """
+    Fetch the most recent SleepSummary within the last `days` plus the 7 days before it.
+
+    Influx does the time filtering and ordering for both windows, so only the
+    current record's timestamp is parsed here.
+    """
+    q = f'SELECT * FROM "SleepSummary" WHERE time > now() - {int(days)}d ORDER BY time DESC LIMIT 1'
+    latest = list(client.query(q).get_points())
+    if not latest:
         return None
 
-    dated.sort(key=lambda x: x[0])
-    current_time, current = dated[-1]
-    start = current_time - timedelta(days=7)
-
-    prior_week = [p for (t, p) in dated if start <= t < current_time]
+    current = latest[0]
+    start = parse_time_utc(current["time"]) - timedelta(days=7)
+    start_s = start.isoformat().replace("+00:00", "Z")
+    q = (
+        'SELECT * FROM "SleepSummary" '
+        f"WHERE time >= '{start_s}' AND time < '{current['time']}' ORDER BY time ASC"
+    )
+    prior_week = list(client.query(q).get_points())
     return current, prior_week
 
 #run one check/send cycle and return T?F depending on if a message is sent
 def run_once() -> bool:
 
     client = connect_influx()
-    points = fetch_sleep_summary_last_days(client, days=8)
-    selection = select_current_and_prior_week(points)
-    current, prior_week_points = selection
+    selection = fetch_current_and_prior_week(client, days=8)
     if selection is None:
         raise SystemExit("No SleepSummary data found in the last 8 days.")
-    
+    current, prior_week_points = selection
+
     sleep_key = (current.get("calendarDate") or current.get("time") or "").strip()
     if not sleep_key:
         raise SystemExit("Could not determine sleep_key (missing calendarDate/time).")
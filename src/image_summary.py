@@ -24,16 +24,19 @@ from __future__ import annotations
 
 import math
 from datetime import timedelta
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Mapping, Sequence, Tuple, Dict
+from typing import Any, Callable, Mapping, Sequence, Tuple, Dict
 
 import matplotlib
 matplotlib.use("Agg")  # headless-safe
 
 import matplotlib.dates as mdates
 import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.collections import PatchCollection
 from matplotlib.colors import to_rgba
-from matplotlib.patches import FancyBboxPatch, Patch, Rectangle
+from matplotlib.patches import FancyBboxPatch, Patch
 from zoneinfo import ZoneInfo
 
 from sleep_report.stages import StageSession
@@ -117,6 +120,38 @@ def format_seconds(seconds: float, *, style: str = "hm") -> str:
     return f"{h}h {m}m" if m else f"{h}h"
 
 
+def _fmt_minutes(v: float) -> str:
+    return format_seconds(v, style="min")
+
+
+def _fmt_hm(v: float) -> str:
+    return format_seconds(v, style="hm")
+
+
+def _fmt_bpm(v: float) -> str:
+    return f"{int(round(v))} bpm"
+
+
+def _fmt_int(v: float) -> str:
+    return f"{int(round(v))}"
+
+
+def _fmt_default(v: float) -> str:
+    return f"{v:.0f}" if abs(v) >= 10 else f"{v:.1f}"
+
+
+# metric -> formatter, built once so each card is a dict lookup instead of an if/elif chain
+_METRIC_FORMATTERS: Dict[str, Callable[[float], str]] = {
+    "awakeSleepSeconds": _fmt_minutes,
+    "deepSleepSeconds": _fmt_hm,
+    "remSleepSeconds": _fmt_hm,
+    "sleepTimeSeconds": _fmt_hm,
+    "restingHeartRate": _fmt_bpm,
+    "sleepScore": _fmt_int,
+}
+_METRIC_FORMATTERS.update({m: _fmt_int for m, _ in METRICS if m.endswith("Count")})
+
+
 def format_metric_value(metric: str, value: Any) -> str:
     if value is None:
         return "—"
@@ -125,17 +160,10 @@ def format_metric_value(metric: str, value: Any) -> str:
     except Exception:
         return "—"
 
-    if metric == "awakeSleepSeconds":
-        return format_seconds(v, style="min")
-    if metric in ("deepSleepSeconds", "remSleepSeconds", "sleepTimeSeconds"):
-        return format_seconds(v, style="hm")
-    if metric == "restingHeartRate":
-        return f"{int(round(v))} bpm"
-    if metric == "sleepScore":
-        return f"{int(round(v))}"
-    if metric.endswith("Count"):
-        return f"{int(round(v))}"
-    return f"{v:.0f}" if abs(v) >= 10 else f"{v:.1f}"
+    fmt = _METRIC_FORMATTERS.get(metric)
+    if fmt is None:
+        fmt = _fmt_int if metric.endswith("Count") else _fmt_default
+    return fmt(v)
 
 
 def card_color_from_score_sigma(score: float, sigma: float, *, cap: float = SIGMA_CAP) -> Tuple[float, float, float, float]:
@@ -157,6 +185,15 @@ def card_color_from_score_sigma(score: float, sigma: float, *, cap: float = SIGM
     return to_rgba(ramp[idx], alpha=alpha)
 
 
+def _float_or_nan(v: Any) -> float:
+    if v is None:
+        return math.nan
+    try:
+        return float(v)
+    except Exception:
+        return math.nan
+
+
 def render_sleep_stage_axis(
     ax: plt.Axes,
     session: StageSession,
@@ -173,36 +210,35 @@ def render_sleep_stage_axis(
     """
     ax.set_facecolor("none")
 
-    pts = sorted(session.points, key=lambda p: parse_time_utc(p["time"]))
-    times_utc = [parse_time_utc(p["time"]) for p in pts]
-    stages = [int(float(p["SleepStageLevel"])) for p in pts]
-
-    # Duration per segment (seconds)
-    durations = []
-    for i, p in enumerate(pts):
-        d = p.get("SleepStageSeconds")
-        if d is not None:
-            try:
-                durations.append(float(d))
-                continue
-            except Exception:
-                pass
-        if i < len(pts) - 1:
-            durations.append((parse_time_utc(pts[i + 1]["time"]) - parse_time_utc(p["time"])).total_seconds())
-        else:
-            durations.append(240.0)
-
-    ends_utc = [times_utc[i] + timedelta(seconds=durations[i]) for i in range(len(times_utc))]
-
-    # Draw stage rectangles
-    for t0, t1, s in zip(times_utc, ends_utc, stages):
+    # build_stage_sessions hands over points already sorted with their parsed times;
+    # other session-likes (e.g. the demo's) get parsed once and sorted here
+    times_utc = getattr(session, "times_utc", None)
+    if times_utc and len(times_utc) == len(session.points):
+        pts = session.points
+    else:
+        dated = sorted(((parse_time_utc(p["time"]), p) for p in session.points), key=itemgetter(0))
+        times_utc = [t for t, _ in dated]
+        pts = [p for _, p in dated]
+    stages = np.array([int(float(p["SleepStageLevel"])) for p in pts])
+
+    # Segment geometry as arrays of matplotlib date numbers (days since epoch, UTC).
+    # Duration per segment is SleepStageSeconds, else the gap to the next point (4 min for the last one).
+    x0s = mdates.date2num(times_utc)
+    durations = np.array([_float_or_nan(p.get("SleepStageSeconds")) for p in pts])
+    gaps = np.append(np.diff(x0s) * 86400.0, 240.0)
+    durations = np.where(np.isnan(durations), gaps, durations)
+    widths = durations / 86400.0
+    x1s = x0s + widths
+    end_utc = times_utc[-1] + timedelta(seconds=float(durations[-1]))
+
+    # Draw stage rectangles: one broken_barh collection per stage instead of a patch per segment
+    for s in dict.fromkeys(stages.tolist()):
         if s not in STAGE_MAP:
             continue
         meta = STAGE_MAP[s]
-        x0 = mdates.date2num(t0)
-        x1 = mdates.date2num(t1)
-        ax.add_patch(
-            Rectangle((x0, 0.0), x1 - x0, meta["level"], facecolor=meta["color"], edgecolor="none")
+        mask = stages == s
+        ax.broken_barh(
+            list(zip(x0s[mask], widths[mask])), (0.0, meta["level"]), facecolors=meta["color"], edgecolors="none"
         )
 
     ax.set_ylim(0.0, 4.25)
@@ -210,26 +246,29 @@ def render_sleep_stage_axis(
     ax.set_title("Sleep Stages", fontsize=18, color="white", pad=10)
 
     # X limits in UTC (geometry)
-    ax.set_xlim(mdates.date2num(times_utc[0]), mdates.date2num(ends_utc[-1]))
+    ax.set_xlim(x0s[0], x1s[-1])
     ax.xaxis_date()
 
     # ----- Manual local-time ticks (robust across matplotlib versions) -----
     start_local = times_utc[0].astimezone(display_tz)
-    end_local = ends_utc[-1].astimezone(display_tz)
+    end_local = end_utc.astimezone(display_tz)
 
     tick_local = start_local.replace(minute=0, second=0, microsecond=0)
     if tick_local < start_local:
         tick_local += timedelta(hours=1)
 
-    tick_positions = []
+    # date2num converts tz-aware datetimes to UTC itself, so collect the local ticks and
+    # convert them in one call. The offset is not hoisted because it can change across DST.
+    tick_times = []
     tick_labels = []
     while tick_local <= end_local:
-        tick_positions.append(mdates.date2num(tick_local.astimezone(ZoneInfo("UTC"))))
+        tick_times.append(tick_local)
         tick_labels.append(tick_local.strftime("%H:%M"))
         tick_local += timedelta(hours=1)
+    tick_positions = list(mdates.date2num(tick_times)) if tick_times else []
 
     if not tick_positions:
-        tick_positions = [mdates.date2num(times_utc[0]), mdates.date2num(ends_utc[-1])]
+        tick_positions = [x0s[0], x1s[-1]]
         tick_labels = [start_local.strftime("%H:%M"), end_local.strftime("%H:%M")]
 
     ax.set_xticks(tick_positions)
@@ -318,6 +357,8 @@ def draw_metric_cards(
     sigma_top_offset = 0.020
     mean_top_offset = 0.060
 
+    # Card backgrounds are collected and added as one PatchCollection after the loop
+    cards: list = []
     for i, (metric, higher_is_better) in enumerate(METRICS):
         rr = i // cols
         cc = i % cols
@@ -339,7 +380,7 @@ def draw_metric_cards(
         sigma = abs(z)
         score = z if higher_is_better else -z
         card_rgba = card_color_from_score_sigma(score, sigma)
-        ax.add_patch(
+        cards.append(
             FancyBboxPatch(
                 (x, y),
                 card_w,
@@ -399,6 +440,36 @@ def draw_metric_cards(
             zorder=10,
         )
 
+    ax.add_collection(PatchCollection(cards, match_original=True))
+
+
+# The scheduler keeps this module resident, so the figure skeleton is built once
+# per process and its two axes are cleared between renders.
+_FIG: plt.Figure | None = None
+_AX_STAGE: plt.Axes | None = None
+_AX_CARDS: plt.Axes | None = None
+
+
+def _report_figure() -> Tuple[plt.Figure, plt.Axes, plt.Axes]:
+    """Return the cached (figure, stage axes, cards axes), building it on first use."""
+    global _FIG, _AX_STAGE, _AX_CARDS
+
+    if _FIG is None:
+        fig = plt.figure(figsize=(14, 9), facecolor=BG_COLOR)
+        gs = fig.add_gridspec(nrows=2, ncols=1, height_ratios=[1.1, 1.3], hspace=0.22)
+
+        # Extra breathing room so x-axis labels + legend (below) don't get clipped
+        fig.subplots_adjust(bottom=0.10, top=0.94, left=0.06, right=0.98)
+
+        _FIG = fig
+        _AX_STAGE = fig.add_subplot(gs[0, 0])
+        _AX_CARDS = fig.add_subplot(gs[1, 0])
+    else:
+        _AX_STAGE.cla()
+        _AX_CARDS.cla()
+
+    return _FIG, _AX_STAGE, _AX_CARDS
+
 
 def render_sleep_report_png(
     *,
@@ -422,20 +493,22 @@ def render_sleep_report_png(
     """
     tz_out = ZoneInfo(display_tz)
 
-    fig = plt.figure(figsize=(14, 9), facecolor=BG_COLOR)
-    gs = fig.add_gridspec(nrows=2, ncols=1, height_ratios=[1.1, 1.3], hspace=0.22)
-
-    # Extra breathing room so x-axis labels + legend (below) don't get clipped
-    fig.subplots_adjust(bottom=0.10, top=0.94, left=0.06, right=0.98)
-
-    ax_stage = fig.add_subplot(gs[0, 0])
-    ax_cards = fig.add_subplot(gs[1, 0])
+    fig, ax_stage, ax_cards = _report_figure()
 
     render_sleep_stage_axis(ax_stage, session, display_tz=tz_out, legend_below_y=legend_below_y)
     draw_metric_cards(ax_cards, current_summary, baselines, cols=3, show_mean=show_mean, show_sigma=show_sigma)
 
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    fig.savefig(output_path, dpi=200, transparent=False, facecolor=fig.get_facecolor(), bbox_inches="tight", pad_inches=0.25)
-    plt.close(fig)
+    # Fast zlib level: the PNG is lossless either way, and the default level spends most of its
+    # time squeezing a few more KB out of a file Telegram recompresses anyway
+    fig.savefig(
+        output_path,
+        dpi=200,
+        transparent=False,
+        facecolor=fig.get_facecolor(),
+        bbox_inches="tight",
+        pad_inches=0.25,
+        pil_kwargs={"compress_level": 1},
+    )
     return output_path
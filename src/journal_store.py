@@ -6,37 +6,73 @@ Measurement (hardcoded name):
   "SleepJournal"
   tags:   chat_id, from_id
   fields: text, msg_type, from_username, from_name, message_id, update_id
+
+By default each entry is written synchronously; a failed write propagates to the
+caller. Callers that flush on their own cadence (the listener, once per poll) pass
+defer_flush=True: the entry is buffered and written with the rest of the batch by
+flush_journal_entries() (also done at exit), or mid-batch once JOURNAL_BATCH_SIZE
+points are pending.
+
+A batch Influx rejects with a 4xx is split to isolate the bad point, which is logged
+and dropped so it can't block the queue (a synchronous write still raises the 4xx). Server/connection errors keep the unwritten
+points pending for the next flush; at most JOURNAL_MAX_PENDING are kept (oldest dropped).
 """
 
 from __future__ import annotations
 
-import os
+import atexit
+from collections import deque
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from influxdb import InfluxDBClient
+from influxdb.exceptions import InfluxDBClientError
+
+# Re-exported for telegram_listener: one shared, memoized client per process
+from sleep_report.influx_fetch import connect_influx  # noqa: F401
+
+JOURNAL_BATCH_SIZE = 50
+JOURNAL_MAX_PENDING = 1000
+
+_pending: List[Dict[str, Any]] = []
+_atexit_registered = False
 
-INFLUXDB_HOST = os.getenv("INFLUXDB_HOST", "localhost")
-INFLUXDB_PORT = int(os.getenv("INFLUXDB_PORT", "8086"))
-INFLUXDB_DATABASE = os.getenv("INFLUXDB_DATABASE", "GarminStats")
-INFLUXDB_USERNAME = os.getenv("INFLUXDB_USERNAME", "") or None
-INFLUXDB_PASSWORD = os.getenv("INFLUXDB_PASSWORD", "") or None
-INFLUXDB_SSL = os.getenv("INFLUXDB_SSL", "false").lower() in ("1", "true", "yes", "y")
-
-
-def connect_influx() -> InfluxDBClient:
-    client = InfluxDBClient(
-        host=INFLUXDB_HOST,
-        port=INFLUXDB_PORT,
-        username=INFLUXDB_USERNAME,
-        password=INFLUXDB_PASSWORD,
-        ssl=INFLUXDB_SSL,
-        verify_ssl=INFLUXDB_SSL,
-        timeout=30,
-        retries=3,
-    )
-    client.switch_database(INFLUXDB_DATABASE)
-    return client
+
+def flush_journal_entries(client: InfluxDBClient, *, drop_rejected: bool = True) -> int:
+    """
+    Write all pending journal points, in a single request when Influx accepts them,
+    and return how many were written.
+    Rejected (4xx) points are always removed from the buffer; with drop_rejected they
+    are logged and skipped, otherwise the first rejection is re-raised once the rest
+    are written. On any other error the unwritten points stay pending and the error
+    is re-raised.
+    """
+    todo = deque([_pending[:]]) if _pending else deque()
+    _pending.clear()
+    rejected: List[InfluxDBClientError] = []
+    written = 0
+    while todo:
+        batch = todo.popleft()
+        try:
+            client.write_points(batch, time_precision="s", batch_size=len(batch))
+            written += len(batch)
+        except InfluxDBClientError as e:
+            if not 400 <= (e.code or 0) < 500:
+                _pending[:0] = [p for b in (batch, *todo) for p in b]
+                raise
+            if len(batch) == 1:
+                print(f"[journal_store] dropping rejected point at {batch[0]['time']}: {e}", flush=True)
+                rejected.append(e)
+                continue
+            mid = len(batch) // 2
+            todo.extendleft((batch[mid:], batch[:mid]))
+        except Exception:
+            _pending[:0] = [p for b in (batch, *todo) for p in b]
+            raise
+
+    if rejected and not drop_rejected:
+        raise rejected[0]
+    return written
 
 
 def write_telegram_journal_entry(
@@ -51,7 +87,9 @@ def write_telegram_journal_entry(
     message_id: Optional[int] = None,
     update_id: Optional[int] = None,
     ts_utc: Optional[datetime] = None,
-) -> None:
+    defer_flush: bool = False,
+) -> int:
+    """Store one journal entry; returns how many pending points this call wrote (0 if only buffered)."""
     if ts_utc is None:
         ts_utc = datetime.now(timezone.utc)
 
@@ -74,4 +112,20 @@ def write_telegram_journal_entry(
     if update_id is not None:
         point["fields"]["update_id"] = int(update_id)
 
-    client.write_points([point], time_precision="s")
+    global _atexit_registered
+    _pending.append(point)
+    if not _atexit_registered:
+        atexit.register(flush_journal_entries, client)
+        _atexit_registered = True
+
+    if len(_pending) > JOURNAL_MAX_PENDING:
+        dropped = len(_pending) - JOURNAL_MAX_PENDING
+        del _pending[:dropped]
+        print(f"[journal_store] buffer full; dropped {dropped} oldest pending point(s)", flush=True)
+
+    if not defer_flush:
+        # Synchronous write: a rejected point raises to the caller
+        return flush_journal_entries(client, drop_rejected=False)
+    if len(_pending) >= JOURNAL_BATCH_SIZE:
+        return flush_journal_entries(client)
+    return 0
@@ -24,15 +24,19 @@ import importlib
 import os
 import random
 import signal
+import sys
 import threading
+import time
 import traceback
 from datetime import datetime
+from functools import lru_cache
 from typing import Callable
 
 
 def log(msg: str) -> None:
+    # Not flushed per line: the run loop flushes stdout once per iteration, before it waits
     ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    print(f"[scheduler {ts}] {msg}", flush=True)
+    print(f"[scheduler {ts}] {msg}")
 
 
 def get_int_env(name: str, default: int) -> int:
@@ -57,7 +61,9 @@ def load_target(spec: str) -> Callable[[], object]:
     return fn  # type: ignore[return-value]
 
 
+@lru_cache(maxsize=None)
 def _default_target_from_summary_output() -> str:
+    # Env vars are fixed for the life of the process, so resolve (and warn) once
     # Support both SUMMARY_OUTPUT and summary_output (your wording)
     summary_output = (
         (os.getenv("SUMMARY_OUTPUT", "") or "").strip()
@@ -106,7 +112,11 @@ def main() -> int:
 
     log(f"Starting. target={target_spec} interval={interval}s jitter=0..{jitter}s")
 
+    # Runs are spaced on a monotonic cadence, so the run's own duration doesn't add drift
+    # and wall-clock (NTP) steps don't shorten or stretch the wait
+    next_deadline = time.monotonic()
     while not stop_event.is_set():
+        next_deadline += interval
         try:
             result = target()
             if isinstance(result, bool):
@@ -118,13 +128,19 @@ def main() -> int:
             return 1
         except Exception:
             log("ERROR: exception during run:")
+            sys.stdout.flush()  # keep the log line ahead of the stderr traceback
             traceback.print_exc()
 
         if args.once:
             return 0
 
-        sleep_for = interval + (random.randint(0, jitter) if jitter > 0 else 0)
-        log(f"Sleeping {sleep_for}s")
+        now = time.monotonic()
+        if next_deadline < now:
+            # Run overran a whole interval: start the next one now rather than bursting to catch up
+            next_deadline = now
+        sleep_for = (next_deadline - now) + (random.randint(0, jitter) if jitter > 0 else 0)
+        log(f"Sleeping {sleep_for:.0f}s")
+        sys.stdout.flush()
         stop_event.wait(sleep_for)
 
     log("Stopped.")
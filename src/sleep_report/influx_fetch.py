@@ -3,7 +3,9 @@
 influx_fetch.py
 
 What this file does:
-  - Establishes an InfluxDB connection using the same env vars as fixed_message.py
+  - Establishes the InfluxDB connection used by fixed_message.py,
+    fixed_image_summary.py, journal_store.py and
+    standalone_functions/sleep_data_export.py (one shared client per process)
   - Provides simple fetch functions:
       * SleepSummary points (for baseline + selecting the current night)
       * SleepIntraday points (for the stage chart / intraday series)
@@ -16,11 +18,14 @@ This file does NOT:
 
 from __future__ import annotations
 
+import json
 import os
 from datetime import datetime
-from typing import Dict, List
+from functools import lru_cache
+from typing import Dict, Iterator, List
 
 from influxdb import InfluxDBClient
+from influxdb.resultset import ResultSet
 
 try:
     from dotenv import load_dotenv
@@ -36,9 +41,19 @@ INFLUXDB_USERNAME = os.getenv("INFLUXDB_USERNAME", "") or None
 INFLUXDB_PASSWORD = os.getenv("INFLUXDB_PASSWORD", "") or None
 INFLUXDB_SSL = os.getenv("INFLUXDB_SSL", "false").lower() in ("1", "true", "yes", "y")
 
+# Rows per chunk for streamed (chunked) queries
+INTRADAY_CHUNK_SIZE = 1000
 
+
+@lru_cache(maxsize=1)
 def connect_influx() -> InfluxDBClient:
-    """Create and return an InfluxDB client (v1 client)."""
+    """
+    Return the process-wide InfluxDB client (v1 client), creating it on first use.
+
+    The scheduler calls run_once repeatedly; reusing one client keeps its
+    requests.Session (pooled keep-alive connections, gzip-accepting by default)
+    across runs instead of reconnecting every tick.
+    """
     client = InfluxDBClient(
         host=INFLUXDB_HOST,
         port=INFLUXDB_PORT,
@@ -61,6 +76,18 @@ def fetch_sleep_summary_last_days(client: InfluxDBClient, days: int = 30) -> Lis
 
 
 
+def fetch_sleep_summary_since(client: InfluxDBClient, start_utc: datetime) -> List[Dict]:
+    """
+    Fetch SleepSummary points at/after start_utc, with no upper bound.
+    Used for incremental refreshes: capping at the local clock would miss rows
+    timestamped ahead of it when host and Influx clocks disagree.
+    """
+    start_s = start_utc.isoformat().replace("+00:00", "Z")
+    q = f"SELECT * FROM \"SleepSummary\" WHERE time >= '{start_s}' ORDER BY time ASC"
+    result = client.query(q)
+    return list(result.get_points())
+
+
 def fetch_sleep_summary_time_range(client: InfluxDBClient, start_utc: datetime, end_utc: datetime) -> List[Dict]:
     """
     Fetch SleepSummary points for a specific UTC time window.
@@ -77,14 +104,44 @@ def fetch_sleep_summary_time_range(client: InfluxDBClient, start_utc: datetime,
     return list(result.get_points())
 
 
+def query_chunked(client: InfluxDBClient, q: str, chunk_size: int) -> Iterator[List[Dict]]:
+    """
+    Run q as a chunked query and yield each chunk's points as it arrives.
+
+    influxdb-python 5.3.2's query(chunked=True) only parses JSON replies, but the
+    client asks for msgpack by default (a msgpack reply bypasses the chunked reader),
+    so the request is made directly with Accept: application/json.
+    """
+    response = client.request(
+        url="query",
+        params={"q": q, "db": client._database, "chunked": "true", "chunk_size": chunk_size},
+        stream=True,
+        headers={**client._headers, "Accept": "application/json"},
+    )
+    try:
+        # One JSON document per line, one line per chunk
+        for line in response.iter_lines():
+            if not line:
+                continue
+            for result in json.loads(line).get("results", []):
+                yield list(ResultSet(result).get_points())
+    finally:
+        response.close()
+
+
 def fetch_sleep_intraday_range(
     client: InfluxDBClient,
     start_utc: datetime,
     end_utc: datetime,
     *,
     measurement: str = "SleepIntraday",
-) -> List[Dict]:
-    """Fetch intraday points for a UTC time window."""
+) -> Iterator[Dict]:
+    """
+    Stream intraday points for a UTC time window.
+
+    Uses a chunked query so points are yielded as each chunk arrives instead of
+    materializing the whole (potentially thousands of rows) result first.
+    """
     # Influx expects RFC3339 timestamps
     start_s = start_utc.isoformat().replace("+00:00", "Z")
     end_s = end_utc.isoformat().replace("+00:00", "Z")
@@ -92,5 +149,5 @@ def fetch_sleep_intraday_range(
         f'SELECT * FROM "{measurement}" '
         f"WHERE time >= '{start_s}' AND time <= '{end_s}' ORDER BY time ASC"
     )
-    result = client.query(q)
-    return list(result.get_points())
+    for chunk in query_chunked(client, q, INTRADAY_CHUNK_SIZE):
+        yield from chunk
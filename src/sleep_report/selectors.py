@@ -23,19 +23,21 @@ from .stages import StageSession
 
 def select_current(summary_points: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
     """Select the most recent SleepSummary record by 'time'."""
-    dated: List[Tuple[datetime, Dict[str, Any]]] = []
+    # Single pass keeping the running max (no sort); '>=' keeps the last of
+    # equal timestamps, as the stable sort did
+    best_t: Optional[datetime] = None
+    best: Optional[Dict[str, Any]] = None
     for p in summary_points:
         t = p.get("time")
         if t is None:
             continue
         try:
-            dated.append((parse_time_utc(t), p))
+            dt = parse_time_utc(t)
         except Exception:
             continue
-    if not dated:
-        return None
-    dated.sort(key=lambda x: x[0])
-    return dict(dated[-1][1])
+        if best_t is None or dt >= best_t:
+            best_t, best = dt, p
+    return dict(best) if best is not None else None
 
 
 def compute_intraday_fetch_window(
@@ -75,5 +77,7 @@ def match_session_to_summary(
     """Pick the session whose end time is closest to the summary time."""
     if not sessions:
         raise ValueError("No StageSession available to match.")
+    # String times hit parse_time_utc's memo, so repeat calls don't re-parse
     target = parse_time_utc(current_summary.get("time"))
-    return min(sessions, key=lambda s: abs((s.end_utc - target).total_seconds()))
+    # timedeltas order the same as their total_seconds(), without the float conversion
+    return min(sessions, key=lambda s: abs(s.end_utc - target))
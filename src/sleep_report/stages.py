@@ -18,51 +18,61 @@ This file does NOT:
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Mapping, Optional, Sequence
+from operator import itemgetter
+from typing import Any, Iterable, List, Mapping, Optional, Tuple
 
 from .time_utils import parse_time_utc
 
 
 @dataclass
 class StageSession:
-    points: List[Dict[str, Any]]
+    points: List[Mapping[str, Any]]  # the caller's rows, shared not copied; treat as read-only
     start_utc: datetime
     end_utc: datetime
     total_stage_seconds: float
+    # Parsed UTC time of each point, parallel to (and sorted like) points, so
+    # consumers don't re-parse and re-sort the rows
+    times_utc: List[datetime] = field(default_factory=list)
 
 
 def build_stage_sessions(
-    intraday_rows: Sequence[Mapping[str, Any]],
+    intraday_rows: Iterable[Mapping[str, Any]],
     *,
     time_key: str = "time",
     stage_key: str = "SleepStageLevel",
     dur_key: str = "SleepStageSeconds",
     gap_hours: float = 6.0,
 ) -> List[StageSession]:
-    rows = [r for r in intraday_rows if r.get(stage_key) is not None and r.get(time_key) is not None]
-    rows.sort(key=lambda r: parse_time_utc(r[time_key]))
-
-    sessions: List[List[Dict[str, Any]]] = []
-    cur: List[Dict[str, Any]] = []
+    # Parse each timestamp once: sort on the parsed value and reuse it for gaps and session bounds
+    dated = sorted(
+        (
+            (parse_time_utc(r[time_key]), r)
+            for r in intraday_rows
+            if r.get(stage_key) is not None and r.get(time_key) is not None
+        ),
+        key=itemgetter(0),
+    )
+
+    sessions: List[Tuple[List[Mapping[str, Any]], List[datetime]]] = []  # (points, times) per session
+    cur: List[Mapping[str, Any]] = []
+    cur_times: List[datetime] = []
     prev_t: Optional[datetime] = None
-    gap_s = gap_hours * 3600
-
-    for r in rows:
-        t = parse_time_utc(r[time_key])
-        if prev_t is not None and (t - prev_t).total_seconds() > gap_s and cur:
-            sessions.append(cur)
-            cur = []
-        cur.append(dict(r))
+    gap = timedelta(hours=gap_hours)  # compare timedeltas directly, no float conversion per row
+
+    for t, r in dated:
+        if prev_t is not None and t - prev_t > gap and cur:
+            sessions.append((cur, cur_times))
+            cur, cur_times = [], []
+        cur.append(r)
+        cur_times.append(t)
         prev_t = t
     if cur:
-        sessions.append(cur)
+        sessions.append((cur, cur_times))
 
     out: List[StageSession] = []
-    for sess in sessions:
-        start = parse_time_utc(sess[0][time_key])
-
+    for sess, times in sessions:
         total = 0.0
         for rr in sess:
             d = rr.get(dur_key)
@@ -74,12 +84,13 @@ def build_stage_sessions(
                 pass
 
         last = sess[-1]
-        last_t = parse_time_utc(last[time_key])
         try:
             last_d_s = float(last.get(dur_key) or 240.0)
         except Exception:
             last_d_s = 240.0
-        end = last_t + timedelta(seconds=last_d_s)
+        end = times[-1] + timedelta(seconds=last_d_s)
 
-        out.append(StageSession(points=sess, start_utc=start, end_utc=end, total_stage_seconds=total))
+        out.append(
+            StageSession(points=sess, start_utc=times[0], end_utc=end, total_stage_seconds=total, times_utc=times)
+        )
     return out
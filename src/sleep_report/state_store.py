@@ -0,0 +1,63 @@
+"""
+state_store.py
+
+What this file does:
+  - Single place for the small JSON state files under /app/data
+    (last sent keys, Telegram listener offset).
+  - json_dumps/json_loads use orjson when installed, stdlib json otherwise.
+  - load_state() is cached per path on the file's mtime, so the scheduler's
+    "already sent" check costs one stat() unless another process rewrote it.
+  - save_state() writes a sibling tmp file and renames it over the old one,
+    so a crash never leaves a torn state file.
+
+This file does NOT:
+  - Query databases
+  - Decide what the state means (callers pick the keys)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+# orjson encodes/decodes bytes in C; fall back to stdlib json if it's missing
+try:
+    from orjson import dumps as json_dumps, loads as json_loads
+except Exception:  # pragma: no cover
+    json_loads = json.loads
+
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+
+# path -> (mtime_ns, data) of each state file as last read/written by this process
+_state_cache: Dict[Path, Tuple[int, Dict[str, Any]]] = {}
+
+
+def load_state(path: Path) -> Optional[Dict[str, Any]]:
+    """Return the JSON object stored at path, or None if missing/unreadable."""
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+        cached = _state_cache.get(path)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+        data = json_loads(path.read_bytes())
+    except Exception:
+        return None
+    if not isinstance(data, dict):
+        return None
+    _state_cache[path] = (mtime_ns, data)
+    return data
+
+
+def save_state(path: Path, data: Dict[str, Any]) -> None:
+    """Persist data to path atomically (tmp file + os.replace); no-op if unchanged."""
+    if load_state(path) == data:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_bytes(json_dumps(data))
+    os.replace(tmp, path)
+    _state_cache[path] = (path.stat().st_mtime_ns, dict(data))
@@ -5,6 +5,8 @@ time_utils.py
 What this file does:
   - Single place for parsing Influx time strings into tz-aware UTC datetimes.
   - Keeps datetime handling consistent across fetch/select/baseline code.
+  - String parses are memoized: the same 'time' value is parsed by the
+    selectors, stage builder and renderer, so repeats become a dict lookup.
 
 This file does NOT:
   - Query databases
@@ -13,25 +15,56 @@ This file does NOT:
 
 from __future__ import annotations
 
+import sys
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Any
 
+# 3.11+ fromisoformat accepts a trailing 'Z' and returns timezone.utc for it
+_NATIVE_Z = sys.version_info >= (3, 11)
+
+_UTC = timezone.utc
+
+# ciso8601's RFC3339 parser is a couple of times faster than fromisoformat and
+# is optional; anything it rejects (no offset, date-only) goes the stdlib route
+try:
+    from ciso8601 import parse_rfc3339 as _parse_rfc3339
+except Exception:  # pragma: no cover
+    _parse_rfc3339 = None
+
+
+@lru_cache(maxsize=8192)
+def _parse_time_str(s: str) -> datetime:
+    # Keyed on the raw string, so the strip only runs on a cache miss
+    s = s.strip()
+    if _parse_rfc3339 is not None:
+        try:
+            dt = _parse_rfc3339(s)
+        except ValueError:
+            pass
+        else:
+            return dt if dt.tzinfo is _UTC else dt.astimezone(_UTC)
+
+    # Influx commonly returns RFC3339 like '...Z'
+    if not _NATIVE_Z and s.endswith("Z"):
+        s = s[:-1] + "+00:00"
+    dt = datetime.fromisoformat(s)
+    if dt.tzinfo is _UTC:
+        return dt
+    return dt.replace(tzinfo=_UTC) if dt.tzinfo is None else dt.astimezone(_UTC)
+
 
 def parse_time_utc(t: Any) -> datetime:
     """Parse Influx 'time' fields into a tz-aware UTC datetime."""
+    # Strings are by far the common case (every Influx/JSONL row): test them first
+    if isinstance(t, str):
+        return _parse_time_str(t)
+
     if isinstance(t, datetime):
-        return t.replace(tzinfo=timezone.utc) if t.tzinfo is None else t.astimezone(timezone.utc)
+        return t.replace(tzinfo=_UTC) if t.tzinfo is None else t.astimezone(_UTC)
 
     if isinstance(t, (int, float)):
         # epoch seconds
-        return datetime.fromtimestamp(float(t), tz=timezone.utc)
-
-    if isinstance(t, str):
-        s = t.strip()
-        # Influx commonly returns RFC3339 like '...Z'
-        if s.endswith("Z"):
-            s = s[:-1] + "+00:00"
-        dt = datetime.fromisoformat(s)
-        return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
+        return datetime.fromtimestamp(float(t), tz=_UTC)
 
     raise TypeError(f"Unsupported time type: {type(t)}")
@@ -43,9 +43,26 @@ def connect_influx() -> InfluxDBClient:
     return client
 
 
-def measurement_exists(client: InfluxDBClient, name: str) -> bool:
-    res = client.query("SHOW MEASUREMENTS")
-    return any(p.get("name") == name for p in res.get_points())
+def drop_measurement(client: InfluxDBClient, name: str) -> bool:
+    """
+    Drop a measurement in a single round-trip; returns False if it didn't exist.
+
+    SHOW and DROP go out as one multi-statement query (POST, since DROP writes).
+    DROP on a missing measurement is a no-op, so the SHOW result alone decides
+    which message to print.
+    """
+    show_res, drop_res = client.query(
+        f'SHOW MEASUREMENTS WITH MEASUREMENT =~ /^{name}$/; DROP MEASUREMENT "{name}"',
+        method="POST",
+        raise_errors=False,
+    )
+    if show_res.error:
+        raise RuntimeError(f"SHOW MEASUREMENTS failed: {show_res.error}")
+
+    existed = any(p.get("name") == name for p in show_res.get_points())
+    if existed and drop_res.error:
+        raise RuntimeError(f"DROP MEASUREMENT failed: {drop_res.error}")
+    return existed
 
 
 def main() -> None:
@@ -58,13 +75,11 @@ def main() -> None:
 
     client = connect_influx()
 
-    if not measurement_exists(client, MEASUREMENT):
+    # DROP MEASUREMENT removes all points/series for that measurement.
+    if not drop_measurement(client, MEASUREMENT):
         print("No SleepJournal Measurements were removed, as none were found in the Influx Database.")
         return
 
-    # DROP MEASUREMENT removes all points/series for that measurement.
-    client.query(f'DROP MEASUREMENT "{MEASUREMENT}"')
-
     print("SleepJournal Measurements were removed")
 
 
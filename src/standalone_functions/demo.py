@@ -29,8 +29,11 @@ import os
 import platform
 import subprocess
 import sys
+from bisect import bisect_left
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
@@ -39,6 +42,12 @@ try:
 except Exception:  # pragma: no cover
     ZoneInfo = None  # type: ignore
 
+# orjson parses bytes in C; fall back to stdlib json (also accepts bytes) if it's missing
+try:
+    from orjson import loads as json_loads
+except Exception:  # pragma: no cover
+    json_loads = json.loads
+
 
 # -----------------------
 # Path / import helpers
@@ -53,36 +62,56 @@ if str(SRC_DIR) not in sys.path:
 
 #import the method to call the image summary
 from fixed_image_summary import run_once
+from sleep_report.time_utils import parse_time_utc
+
+# Import the project formatter once; build_text_summary falls back if this fails
+try:
+    from deterministic_output import build_sleep_summary_text
+    _summary_import_error: Optional[Exception] = None
+except Exception as e:  # pragma: no cover
+    build_sleep_summary_text = None  # type: ignore
+    _summary_import_error = e
 
 # -----------------------
-# Time + JSONL helpers
+# JSONL helpers
 # -----------------------
-def parse_time_utc(s: str) -> datetime:
-    # Influx-like timestamps often end with "Z"
-    s = s.strip()
-    if s.endswith("Z"):
-        s = s[:-1] + "+00:00"
-    dt = datetime.fromisoformat(s)
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
-    return dt.astimezone(timezone.utc)
-
-
 def iter_jsonl(path: Path) -> Iterable[Dict[str, Any]]:
-    with path.open("r", encoding="utf-8") as f:
-        for line in f:
+    # Binary mode: lines go straight to the parser without a UTF-8 decode step
+    with path.open("rb") as f:
+        for line_no, line in enumerate(f, 1):
             line = line.strip()
             if not line:
                 continue
-            yield json.loads(line)
+            try:
+                obj = json_loads(line)
+            except ValueError as e:  # json/orjson decode errors are ValueErrors
+                raise SystemExit(f"Invalid JSON on line {line_no} of {path.name}: {e}")
+            yield obj
 
 
+@lru_cache(maxsize=1)
 def resolve_tz() -> str:
-    # Prefer LOCAL_TIMEZONE, then TZ, else default
+    # Prefer LOCAL_TIMEZONE, then TZ, else default (env doesn't change mid-run)
     tz = (os.getenv("LOCAL_TIMEZONE", "") or "").strip() or (os.getenv("TZ", "") or "").strip()
     return tz or "America/Toronto"
 
 
+@lru_cache(maxsize=4)
+def get_zone(tz_name: str) -> Optional[ZoneInfo]:
+    """ZoneInfo for tz_name, looked up once per name (None without zoneinfo)."""
+    return ZoneInfo(tz_name) if ZoneInfo else None
+
+
+def _safe_float(x: Any) -> Optional[float]:
+    # Summary metrics come out of JSON as floats almost always: hand those straight back
+    if type(x) is float:
+        return x
+    try:
+        return float(x)
+    except Exception:
+        return None
+
+
 # -----------------------
 # Text summary (reuse your project logic if present)
 # -----------------------
@@ -92,23 +121,17 @@ def build_text_summary(current_sleep: Dict[str, Any], prior_week: List[Dict[str,
     Fallback to a minimal internal formatter if it's missing.
     """
     try:
-        from deterministic_output import build_sleep_summary_text  # type: ignore
-
+        if build_sleep_summary_text is None:
+            raise _summary_import_error  # type: ignore[misc]
         return build_sleep_summary_text(
             current_sleep=current_sleep,
             prior_week_sleeps=prior_week,
         )
     except Exception as e:
         # Minimal fallback (keeps demo usable even if imports move)
-        def safe_float(x: Any) -> Optional[float]:
-            try:
-                return float(x)
-            except Exception:
-                return None
-
         def avg_metric(rows: List[Dict[str, Any]], key: str) -> Optional[float]:
-            vals = [safe_float(r.get(key)) for r in rows]
-            vals = [v for v in vals if v is not None]
+            # Convert and filter in one pass (sum/len also beats statistics.fmean at this size)
+            vals = [v for v in map(_safe_float, (r.get(key) for r in rows)) if v is not None]
             return sum(vals) / len(vals) if vals else None
 
         def fmt_seconds_to_hm(sec: float) -> str:
@@ -132,7 +155,7 @@ def build_text_summary(current_sleep: Dict[str, Any], prior_week: List[Dict[str,
 
         lines: List[str] = [f"(Fallback summary; deterministic_output import failed: {e})"]
         for k, hib, label, kind in METRICS:
-            v = safe_float(current_sleep.get(k))
+            v = _safe_float(current_sleep.get(k))
             if v is None:
                 lines.append(f"{label}: missing")
                 continue
@@ -177,22 +200,27 @@ def compute_baselines(summary_rows: List[Dict[str, Any]]) -> Dict[str, Tuple[flo
         "sleepTimeSeconds",
     ]
 
-    def safe_float(x: Any) -> Optional[float]:
-        try:
-            return float(x)
-        except Exception:
-            return None
+    # One pass over the rows filling a float column per metric (as
+    # sleep_report.baselines does), instead of re-scanning the rows per metric
+    columns: Dict[str, List[float]] = {m: [] for m in metrics}
+    for r in summary_rows:
+        for m, vals in columns.items():
+            v = r.get(m)
+            if v is None:
+                continue
+            try:
+                vals.append(float(v))
+            except Exception:
+                continue
 
     out: Dict[str, Tuple[float, float]] = {}
-    for m in metrics:
-        vals = [safe_float(r.get(m)) for r in summary_rows]
-        vals = [v for v in vals if v is not None]
+    for m, vals in columns.items():
         if len(vals) < 2:
             mean = vals[0] if vals else 0.0
             out[m] = (float(mean), 0.0)
             continue
         mean = sum(vals) / len(vals)
-        var = sum((v - mean) ** 2 for v in vals) / (len(vals) - 1)
+        var = sum([(v - mean) * (v - mean) for v in vals]) / (len(vals) - 1)
         out[m] = (float(mean), float(var ** 0.5))
     return out
 
@@ -201,13 +229,13 @@ def pick_current_and_prior_week(records: List[Dict[str, Any]], tz_name: str) ->
     """
     Choose most recent by 'time' (UTC), then prior-week by local date window.
     """
-    tz = ZoneInfo(tz_name) if ZoneInfo else None
+    tz = get_zone(tz_name)
     rows = []
     for r in records:
         t = r.get("time")
         if isinstance(t, str):
             rows.append((parse_time_utc(t), r))
-    rows.sort(key=lambda x: x[0])
+    rows.sort(key=itemgetter(0))
     if not rows:
         raise SystemExit("No valid records found in Demo_SleepSummary.jsonl")
 
@@ -216,11 +244,16 @@ def pick_current_and_prior_week(records: List[Dict[str, Any]], tz_name: str) ->
 
     # prior 7 days excluding current local day
     start_date = current_local_date - timedelta(days=7)
-    prior_week: List[Dict[str, Any]] = []
-    for t, r in rows[:-1]:
-        d = t.astimezone(tz).date() if tz else t.date()
-        if start_date <= d < current_local_date:
-            prior_week.append(r)
+
+    # rows are sorted by UTC time, so the local-date window is a contiguous slice:
+    # bisect on the UTC instants of the two local midnights instead of converting every row
+    day_tz = tz or timezone.utc
+    lo_utc = datetime(start_date.year, start_date.month, start_date.day, tzinfo=day_tz)
+    hi_utc = datetime(current_local_date.year, current_local_date.month, current_local_date.day, tzinfo=day_tz)
+    times = [t for t, _ in rows]
+    lo = bisect_left(times, lo_utc)
+    hi = bisect_left(times, hi_utc)
+    prior_week: List[Dict[str, Any]] = [r for _, r in rows[lo:hi]]
 
     return current, prior_week
 
@@ -229,52 +262,55 @@ def select_intraday_window(
     *,
     end_utc: datetime,
     total_session_seconds: float,
-    require_key: str | None = None,
 ) -> List[Dict[str, Any]]:
     """
     Approximate sleep window:
       start = end - (sleepTimeSeconds + awakeSleepSeconds)
     Then filter intraday points in [start-10m, end+10m].
-
-    If require_key is set, only include rows where row[require_key] is not None.
     """
     start_utc = end_utc - timedelta(seconds=total_session_seconds)
     lo = start_utc - timedelta(minutes=10)
     hi = end_utc + timedelta(minutes=10)
 
-    pts: List[Dict[str, Any]] = []
+    # Keep the parsed time with each row so the sort doesn't parse it again.
+    dated: List[Tuple[datetime, Dict[str, Any]]] = []
     for r in intraday_rows:
         t = r.get("time")
         if not isinstance(t, str):
             continue
         dt = parse_time_utc(t)
-        if not (lo <= dt <= hi):
-            continue
+        if lo <= dt <= hi:
+            dated.append((dt, r))
 
-        if require_key is not None:
-            if r.get(require_key) is None:
-                continue
+    dated.sort(key=itemgetter(0))
+    return [r for _, r in dated]
 
-        pts.append(r)
 
-    pts.sort(key=lambda r: parse_time_utc(r["time"]))
-    return pts
-   
+# Host facts for try_open_image, probed once at import (no stat/uname per call)
+_IN_DOCKER = Path("/.dockerenv").exists()
+_HAS_DISPLAY = bool(os.getenv("DISPLAY") or os.getenv("WAYLAND_DISPLAY"))
+_SYSTEM = platform.system().lower()
+_AUTO_OPEN = (os.getenv("SLEEP_CHECKIN_AUTO_OPEN", "true") or "").strip().lower() not in ("0", "false", "no", "n")
+
 
 def try_open_image(path: Path) -> None:
     """
     Best-effort open. In Docker/headless this may do nothing; always prints the path.
+    Set SLEEP_CHECKIN_AUTO_OPEN=false to never spawn a viewer.
     """
     print(f"Image written: {path}")
 
-    # If running in docker or headless, opening likely won't work
-    in_docker = Path("/.dockerenv").exists()
-    if in_docker and not os.getenv("DISPLAY"):
+    if not _AUTO_OPEN:
+        return
+
+    # Docker, or Linux with no display server: xdg-open can't show anything, so
+    # don't pay for the fork+exec
+    if (_IN_DOCKER or _SYSTEM.startswith("linux")) and not _HAS_DISPLAY:
         print("Not opening image (Docker/headless). Open it from the host filesystem.")
         return
 
     try:
-        system = platform.system().lower()
+        system = _SYSTEM
         if system.startswith("linux"):
             subprocess.Popen(["xdg-open", str(path)], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
         elif system == "darwin":
@@ -290,6 +326,7 @@ def try_open_image(path: Path) -> None:
 
 def main() -> None:
     tz_name = resolve_tz()
+    tz = get_zone(tz_name)
 
     data_dir = REPO_ROOT / "data"
     summary_path = data_dir / "Demo_SleepSummary.jsonl"
@@ -301,7 +338,9 @@ def main() -> None:
         raise SystemExit(f"Missing sample file: {intraday_path}")
 
     summary_records = list(iter_jsonl(summary_path))
-    intraday_records = list(iter_jsonl(intraday_path))
+    # Only sleep-stage rows are used below (a few percent of the file): drop the
+    # rest while streaming so their dicts never accumulate in memory
+    stage_records = [r for r in iter_jsonl(intraday_path) if r.get("SleepStageLevel") is not None]
 
     # 1) Pick current + prior week
     current, prior_week = pick_current_and_prior_week(summary_records, tz_name)
@@ -318,10 +357,9 @@ def main() -> None:
     total_session_seconds = max(0.0, sleep_sec + awake_sec)
 
     stage_points = select_intraday_window(
-        intraday_records,
+        stage_records,  # already limited to non-null SleepStageLevel rows
         end_utc=end_utc,
         total_session_seconds=total_session_seconds,
-        require_key="SleepStageLevel",   #avoids null values
     )
     if not stage_points:
         raise SystemExit("Could not find any intraday rows with SleepStageLevel for the most recent sleep window in Demo_SleepIntraday.jsonl")
@@ -335,7 +373,7 @@ def main() -> None:
     out_dir = REPO_ROOT / "exports" / "summary_screenshots"
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    day_key = end_utc.astimezone(ZoneInfo(tz_name)).date().isoformat() if ZoneInfo else end_utc.date().isoformat()
+    day_key = (end_utc.astimezone(tz) if tz else end_utc).date().isoformat()
 
     # 3) Build image summary
     print("\n=== IMAGE SUMMARY (sample data) ===\n")
@@ -24,11 +24,15 @@ Timezone resolution order:
 """
 
 import os
+import sys
 import json
 import csv
+import queue
+import threading
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 try:
     from zoneinfo import ZoneInfo  # Python 3.9+
@@ -43,18 +47,32 @@ try:
 except Exception:
     pass
 
+# Make parent src/ importable so the export shares the project's Influx client
+# (same INFLUXDB_* env vars, one client and connection pool per process)
+SRC_DIR = Path(__file__).resolve().parents[1]
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from sleep_report.influx_fetch import connect_influx, query_chunked  # noqa: E402
+
+# orjson serializes straight to UTF-8 bytes; fall back to stdlib json if it's missing
+try:
+    import orjson
+
+    def jsonl_line(p: Dict) -> bytes:
+        return orjson.dumps(p, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+except Exception:  # pragma: no cover
+    def jsonl_line(p: Dict) -> bytes:
+        return (json.dumps(p, ensure_ascii=False) + "\n").encode("utf-8")
+
 
 # --------------------
 # Config
 # --------------------
-INFLUXDB_HOST = os.getenv("INFLUXDB_HOST", "localhost")
-INFLUXDB_PORT = int(os.getenv("INFLUXDB_PORT", "8086"))
-INFLUXDB_DATABASE = os.getenv("INFLUXDB_DATABASE", "GarminStats")
-INFLUXDB_USERNAME = os.getenv("INFLUXDB_USERNAME", "") or None
-INFLUXDB_PASSWORD = os.getenv("INFLUXDB_PASSWORD", "") or None
-INFLUXDB_SSL = os.getenv("INFLUXDB_SSL", "false").lower() in ("1", "true", "yes", "y")
-
 CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", "5000"))
+# Export files are written sequentially; a 1 MiB buffer means one write()
+# syscall per MiB instead of per 8 KiB default block
+WRITE_BUFFER_BYTES = 1 << 20
 OUT_DIR = Path(os.getenv("OUT_DIR", "exports"))
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -87,6 +105,9 @@ SLEEP_STAGE_LABELS: Dict[int, str] = {
     3: "Awake",
 }
 
+# Codes are dense 0..3, so index a tuple instead of hashing into the dict per row
+_STAGE_LABELS_BY_CODE = tuple(SLEEP_STAGE_LABELS[c] for c in range(len(SLEEP_STAGE_LABELS)))
+
 EXCLUDE_CSV_COLUMNS = {
     "Device",
     "Database_Name",
@@ -100,8 +121,23 @@ EXCLUDE_CSV_COLUMNS = {
 # --------------------
 # Helpers
 # --------------------
+# 3.11+ fromisoformat accepts a trailing 'Z' natively
+_NATIVE_Z = sys.version_info >= (3, 11)
+
+# Optional faster RFC3339 parser; falls back to fromisoformat below
+try:
+    from ciso8601 import parse_rfc3339 as _parse_rfc3339
+except Exception:  # pragma: no cover
+    _parse_rfc3339 = None
+
+
 def parse_influx_time(time_str: str) -> datetime:
-    dt = datetime.fromisoformat(time_str.replace("Z", "+00:00"))
+    if _parse_rfc3339 is not None:
+        try:
+            return _parse_rfc3339(time_str)
+        except ValueError:
+            pass
+    dt = datetime.fromisoformat(time_str if _NATIVE_Z else time_str.replace("Z", "+00:00"))
     return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
 
 
@@ -121,6 +157,17 @@ def metric_label(metric: str) -> str:
     return METRIC_COLUMN_LABELS.get(metric, metric)
 
 
+def sleep_stage_label(value: object) -> str:
+    try:
+        code = int(value)  # Influx returns stage codes as floats/ints; no float() round-trip needed
+    except Exception:
+        try:
+            code = int(float(value))  # e.g. "1.0"
+        except Exception:
+            return "UNKNOWN"
+    return _STAGE_LABELS_BY_CODE[code] if 0 <= code < len(_STAGE_LABELS_BY_CODE) else "UNKNOWN"
+
+
 def should_exclude_csv_col(col: str) -> bool:
     return col in EXCLUDE_CSV_COLUMNS
 
@@ -136,7 +183,9 @@ def read_etc_timezone() -> Optional[str]:
         return None
 
 
+@lru_cache(maxsize=1)
 def resolve_local_timezone() -> Tuple[str, timezone]:
+    # Env and /etc/timezone don't change mid-run: resolve once and hand out the same tzinfo
     tz_name = LOCAL_TIMEZONE_ENV or TZ_ENV or read_etc_timezone() or "UTC"
 
     if tz_name.upper() == "UTC" or ZoneInfo is None:
@@ -151,44 +200,61 @@ def resolve_local_timezone() -> Tuple[str, timezone]:
 # --------------------
 # Influx utilities
 # --------------------
-def connect_influx() -> InfluxDBClient:
-    client = InfluxDBClient(
-        host=INFLUXDB_HOST,
-        port=INFLUXDB_PORT,
-        username=INFLUXDB_USERNAME,
-        password=INFLUXDB_PASSWORD,
-        ssl=INFLUXDB_SSL,
-        verify_ssl=INFLUXDB_SSL,
-        timeout=30,
-        retries=3,
-    )
-    client.switch_database(INFLUXDB_DATABASE)
-    return client
-
-
 def list_measurements(client: InfluxDBClient) -> List[str]:
     result = client.query("SHOW MEASUREMENTS")
     return [p["name"] for p in result.get_points()]
 
 
+PREFETCH_CHUNKS = 8
+
+
 def stream_points(client: InfluxDBClient, measurement: str, chunk_size: int) -> Iterable[Dict]:
-    last_time = "1970-01-01T00:00:00Z"
-    while True:
-        q = (
-            f'SELECT * FROM "{measurement}" '
-            f"WHERE time > '{last_time}' "
-            f"ORDER BY time ASC "
-            f"LIMIT {chunk_size}"
-        )
-        result = client.query(q)
-        points = list(result.get_points())
-        if not points:
-            break
-        for p in points:
-            yield p
-        last_time = points[-1]["time"]
-        if len(points) < chunk_size:
-            break
+    # One chunked query: Influx streams the result in chunk_size batches over a
+    # single response instead of re-planning a LIMIT/seek query per chunk.
+    # A reader thread keeps pulling chunks off the socket (bounded queue) while
+    # the caller formats and writes the previous ones. If the caller stops early
+    # (generator closed, write error) it sets `stop`, so the reader gives up on the
+    # queue instead of blocking forever with the response still open.
+    q = f'SELECT * FROM "{measurement}" ORDER BY time ASC'
+    chunks: "queue.Queue[object]" = queue.Queue(maxsize=PREFETCH_CHUNKS)
+    done = object()
+    failure: List[BaseException] = []
+    stop = threading.Event()
+
+    def put(item: object) -> bool:
+        while not stop.is_set():
+            try:
+                chunks.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce() -> None:
+        reader = query_chunked(client, q, chunk_size)
+        try:
+            for chunk in reader:
+                if not put(chunk):
+                    break
+        except BaseException as e:  # re-raised on the consumer side
+            failure.append(e)
+        finally:
+            reader.close()  # releases the HTTP response
+            put(done)
+
+    threading.Thread(target=produce, name=f"stream-{measurement}", daemon=True).start()
+
+    try:
+        while True:
+            chunk = chunks.get()
+            if chunk is done:
+                break
+            yield from chunk  # type: ignore[misc]
+    finally:
+        stop.set()
+
+    if failure:
+        raise failure[0]
 
 
 # --------------------
@@ -200,7 +266,7 @@ def export_sleep_summary(client: InfluxDBClient, tz_name: str, tzinfo_obj: timez
     csv_path = OUT_DIR / f"{measurement}.csv"
     local_header = local_time_header(tz_name)
 
-    with jsonl_path.open("w", encoding="utf-8") as jsonl_file:
+    with jsonl_path.open("wb", buffering=WRITE_BUFFER_BYTES) as jsonl_file:
         points_iter = stream_points(client, measurement, CHUNK_SIZE)
         try:
             first = next(points_iter)
@@ -215,22 +281,21 @@ def export_sleep_summary(client: InfluxDBClient, tz_name: str, tzinfo_obj: timez
 
         fieldnames = [local_header] + other_cols + ["time_utc"]
 
-        with csv_path.open("w", encoding="utf-8", newline="") as csv_file:
-            w = csv.DictWriter(csv_file, fieldnames=fieldnames)
-            w.writeheader()
+        with csv_path.open("w", encoding="utf-8", newline="", buffering=WRITE_BUFFER_BYTES) as csv_file:
+            w = csv.writer(csv_file)
+            w.writerow(fieldnames)
 
             def write_point(p: Dict) -> None:
-                jsonl_file.write(json.dumps(p, ensure_ascii=False) + "\n")
+                jsonl_file.write(jsonl_line(p))
                 dt_utc = parse_influx_time(p["time"])
                 dt_local = dt_utc.astimezone(tzinfo_obj)
 
-                row: Dict[str, object] = {local_header: format_local(dt_local, tz_name)}
-                for k, v in p.items():
-                    if k == "time" or should_exclude_csv_col(k):
-                        continue
-                    row[k] = v
-                row["time_utc"] = format_utc(dt_utc)
-                w.writerow(row)
+                # Positional row in fieldnames order (Influx gives every point the same columns)
+                w.writerow((
+                    format_local(dt_local, tz_name),
+                    *[p.get(k) for k in other_cols],
+                    format_utc(dt_utc),
+                ))
 
             write_point(first)
             for p in points_iter:
@@ -245,13 +310,13 @@ def export_sleep_intraday(client: InfluxDBClient, tz_name: str, tzinfo_obj: time
     local_header = local_time_header(tz_name)
 
     files: Dict[str, object] = {}
-    writers: Dict[str, csv.DictWriter] = {}
+    writers: Dict[str, Any] = {}
 
     # Create per-metric CSVs
     metric_paths: Dict[str, Path] = {}
     for metric in INTRADAY_METRICS:
         metric_path = OUT_DIR / f"{measurement}_{metric}.csv"
-        f = metric_path.open("w", encoding="utf-8", newline="")
+        f = metric_path.open("w", encoding="utf-8", newline="", buffering=WRITE_BUFFER_BYTES)
         mcol = metric_label(metric)
 
         fieldnames = [local_header, mcol]
@@ -259,45 +324,54 @@ def export_sleep_intraday(client: InfluxDBClient, tz_name: str, tzinfo_obj: time
             fieldnames.append("Sleep Stage (label)")
         fieldnames.append("time_utc")
 
-        w = csv.DictWriter(f, fieldnames=fieldnames)
-        w.writeheader()
+        w = csv.writer(f)
+        w.writerow(fieldnames)
 
         files[metric] = f
         writers[metric] = w
         metric_paths[metric] = metric_path
 
     points_written = 0
+    # Rows are plain tuples in header order, buffered per metric and handed to
+    # writerows once per CHUNK_SIZE points instead of one DictWriter call per cell
+    pending: Dict[str, List[tuple]] = {m: [] for m in INTRADAY_METRICS}
     metric_rows = {m: 0 for m in INTRADAY_METRICS}
 
-    with jsonl_path.open("w", encoding="utf-8") as jsonl_file:
+    def flush_rows() -> None:
+        for metric, rows in pending.items():
+            if rows:
+                writers[metric].writerows(rows)
+                metric_rows[metric] += len(rows)
+                rows.clear()
+
+    # Bound appends resolved once, and the stage-label branch taken out of the
+    # per-metric loop, so each point costs one dict.get per metric and no
+    # string compare
+    value_appends = [(m, pending[m].append) for m in INTRADAY_METRICS if m != "SleepStageLevel"]
+    append_stage = pending["SleepStageLevel"].append
+
+    with jsonl_path.open("wb", buffering=WRITE_BUFFER_BYTES) as jsonl_file:
         for p in stream_points(client, measurement, CHUNK_SIZE):
             points_written += 1
-            jsonl_file.write(json.dumps(p, ensure_ascii=False) + "\n")
+            jsonl_file.write(jsonl_line(p))
 
             dt_utc = parse_influx_time(p["time"])
-            dt_local = dt_utc.astimezone(tzinfo_obj)
+            local_s = format_local(dt_utc.astimezone(tzinfo_obj), tz_name)
+            utc_s = format_utc(dt_utc)
 
-            for metric in INTRADAY_METRICS:
+            for metric, append in value_appends:
                 value = p.get(metric)
-                if value is None:
-                    continue
-
-                mcol = metric_label(metric)
-                row: Dict[str, object] = {
-                    local_header: format_local(dt_local, tz_name),
-                    mcol: value,
-                }
-
-                if metric == "SleepStageLevel":
-                    try:
-                        code = int(float(value))
-                        row["Sleep Stage (label)"] = SLEEP_STAGE_LABELS.get(code, "UNKNOWN")
-                    except Exception:
-                        row["Sleep Stage (label)"] = "UNKNOWN"
-
-                row["time_utc"] = format_utc(dt_utc)
-                writers[metric].writerow(row)
-                metric_rows[metric] += 1
+                if value is not None:
+                    append((local_s, value, utc_s))
+
+            value = p.get("SleepStageLevel")
+            if value is not None:
+                append_stage((local_s, value, sleep_stage_label(value), utc_s))
+
+            if points_written % CHUNK_SIZE == 0:
+                flush_rows()
+
+    flush_rows()
 
     for f in files.values():
         f.close()
@@ -312,7 +386,7 @@ def export_sleep_insight_journal(client: InfluxDBClient, tz_name: str, tzinfo_ob
     csv_path = OUT_DIR / f"{measurement}.csv"
     local_header = local_time_header(tz_name)
 
-    with jsonl_path.open("w", encoding="utf-8") as jsonl_file:
+    with jsonl_path.open("wb", buffering=WRITE_BUFFER_BYTES) as jsonl_file:
         points_iter = stream_points(client, measurement, CHUNK_SIZE)
         try:
             first = next(points_iter)
@@ -340,24 +414,22 @@ def export_sleep_insight_journal(client: InfluxDBClient, tz_name: str, tzinfo_ob
 
         fieldnames = [local_header] + preferred + other_cols + ["time_utc"]
 
-        with csv_path.open("w", encoding="utf-8", newline="") as csv_file:
-            w = csv.DictWriter(csv_file, fieldnames=fieldnames, extrasaction="ignore")
-            w.writeheader()
+        row_cols = preferred + other_cols
+
+        with csv_path.open("w", encoding="utf-8", newline="", buffering=WRITE_BUFFER_BYTES) as csv_file:
+            w = csv.writer(csv_file)
+            w.writerow(fieldnames)
 
             def write_point(p: Dict) -> None:
-                jsonl_file.write(json.dumps(p, ensure_ascii=False) + "\n")
+                jsonl_file.write(jsonl_line(p))
                 dt_utc = parse_influx_time(p["time"])
                 dt_local = dt_utc.astimezone(tzinfo_obj)
 
-                row: Dict[str, object] = {local_header: format_local(dt_local, tz_name)}
-
-                for k in preferred:
-                    row[k] = p.get(k)
-                for k in other_cols:
-                    row[k] = p.get(k)
-
-                row["time_utc"] = format_utc(dt_utc)
-                w.writerow(row)
+                w.writerow((
+                    format_local(dt_local, tz_name),
+                    *[p.get(k) for k in row_cols],
+                    format_utc(dt_utc),
+                ))
 
             write_point(first)
             for p in points_iter:
@@ -10,12 +10,14 @@ Environment variables required:
 
 Public API:
     send_message(text: str) -> None
+    telegram_session() -> requests.Session
 
 """
 
 from __future__ import annotations
 
 import os
+from functools import lru_cache
 
 import requests
 
@@ -27,6 +29,17 @@ except Exception:
     pass
 
 
+@lru_cache(maxsize=1)
+def telegram_session() -> requests.Session:
+    """
+    Return the process-wide requests.Session for Bot API calls, creating it on first use.
+
+    The listener long-polls and sends confirmations back-to-back; a shared session keeps
+    the TLS connection to api.telegram.org alive instead of handshaking per request.
+    """
+    return requests.Session()
+
+
 def send_message(text: str, *, disable_web_page_preview: bool = True) -> None:
     """Send a plain text message to a Telegram chat via bot API."""
     bot_token = (os.getenv("TELEGRAM_BOT_TOKEN", "") or "").strip()
@@ -36,7 +49,7 @@ def send_message(text: str, *, disable_web_page_preview: bool = True) -> None:
         raise SystemExit("Missing TELEGRAM_BOT_TOKEN or TELEGRAM_CHAT_ID.")
 
     url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
-    resp = requests.post(
+    resp = telegram_session().post(
         url,
         data={
             "chat_id": chat_id,
@@ -21,24 +21,24 @@ State to know if it is a new message:
 
 from __future__ import annotations
 
-import json
 import os
-import re
+import signal
+import sys
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
-import requests
-
 try:
     from dotenv import load_dotenv  # type: ignore
     load_dotenv()
 except Exception:
     pass
 
-from journal_store import connect_influx, write_telegram_journal_entry
-from telegram_client import send_message
+from journal_store import connect_influx, flush_journal_entries, write_telegram_journal_entry
+from sleep_report.state_store import json_loads, load_state, save_state
+from telegram_client import send_message, telegram_session
 
 
 BOT_TOKEN = (os.getenv("TELEGRAM_BOT_TOKEN", "") or "").strip()
@@ -62,9 +62,13 @@ STATE_PATH = Path("/app/data/telegram_listener_state.json")
 LONGPOLL_TIMEOUT = int(os.getenv("TELEGRAM_LONGPOLL_TIMEOUT_SECONDS", "50"))
 POLL_SLEEP = float(os.getenv("TELEGRAM_POLL_SLEEP_SECONDS", "1"))
 
-# Remove control chars; then normalize whitespace.
-CONTROL = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]")
-WHITESPACE = re.compile(r"\s+")
+# Confirmations go out on worker threads so a burst of messages isn't serialized
+# behind one HTTPS round-trip each (the shared requests.Session is thread-safe for this)
+_CONFIRM_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="tg-confirm")
+
+# Remove control chars (everything below 0x20 except \t \n \r, plus DEL); then normalize whitespace.
+# str.translate with a delete table does this in one C pass, no regex engine.
+CONTROL_TABLE = dict.fromkeys([*range(0x00, 0x09), 0x0B, 0x0C, *range(0x0E, 0x20), 0x7F])
 
 
 def _api_url(method: str) -> str:
@@ -72,9 +76,8 @@ def _api_url(method: str) -> str:
 
 
 def sanitize_text(s: str, max_len: int = MAX_JOURNAL_CHARS) -> str:
-    s = s.strip()
-    s = CONTROL.sub("", s)
-    s = WHITESPACE.sub(" ", s).strip()
+    # split()/join collapses every whitespace run (same set as regex \s) and strips both ends
+    s = " ".join(s.translate(CONTROL_TABLE).split())
     if len(s) > max_len:
         s = s[:max_len]
     return s
@@ -82,19 +85,17 @@ def sanitize_text(s: str, max_len: int = MAX_JOURNAL_CHARS) -> str:
 
 def load_offset() -> int:
     try:
-        data = json.loads(STATE_PATH.read_text(encoding="utf-8"))
-        return int(data.get("offset", 0))
+        return int((load_state(STATE_PATH) or {}).get("offset", 0))
     except Exception:
         return 0
 
 
 def save_offset(offset: int) -> None:
-    STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
-    STATE_PATH.write_text(json.dumps({"offset": offset}), encoding="utf-8")
+    save_state(STATE_PATH, {"offset": offset})
 
 
 def get_updates(offset: int) -> List[Dict[str, Any]]:
-    resp = requests.get(
+    resp = telegram_session().get(
         _api_url("getUpdates"),
         params={"offset": offset, "timeout": LONGPOLL_TIMEOUT},
         timeout=LONGPOLL_TIMEOUT + 10,
@@ -102,7 +103,8 @@ def get_updates(offset: int) -> List[Dict[str, Any]]:
     if resp.status_code != 200:
         raise RuntimeError(f"Telegram getUpdates failed: HTTP {resp.status_code} {resp.text}")
 
-    payload = resp.json()
+    # Decode the raw bytes directly (no charset detection / str decode step)
+    payload = json_loads(resp.content)
     if not payload.get("ok"):
         raise RuntimeError(f"Telegram getUpdates returned ok=false: {payload}")
 
@@ -118,15 +120,16 @@ def extract_message(update: Dict[str, Any]) -> Optional[Tuple[int, Dict[str, Any
     return None
 
 
-def handle_message(influx_client, update_id: int, msg: Dict[str, Any]) -> None:
+def handle_message(influx_client, update_id: int, msg: Dict[str, Any]) -> int:
+    """Queue msg as a journal entry; returns how many journal points were written meanwhile."""
     chat = msg.get("chat") or {}
     chat_id = chat.get("id")
     if chat_id is None:
-        return
+        return 0
 
     # Only accept messages from TELEGRAM_CHAT_ID
     if str(chat_id) != str(CHAT_ID):
-        return
+        return 0
 
     from_obj = msg.get("from") or {}
     from_id = str(from_obj.get("id", ""))
@@ -145,7 +148,7 @@ def handle_message(influx_client, update_id: int, msg: Dict[str, Any]) -> None:
         text = "[non-text message]"
         msg_type = "non_text"
 
-    write_telegram_journal_entry(
+    return write_telegram_journal_entry(
         influx_client,
         chat_id=str(chat_id),
         from_id=from_id,
@@ -156,10 +159,27 @@ def handle_message(influx_client, update_id: int, msg: Dict[str, Any]) -> None:
         message_id=message_id if isinstance(message_id, int) else None,
         update_id=update_id,
         ts_utc=datetime.now(timezone.utc),
+        defer_flush=True,  # run_listener_forever writes the whole poll's entries in one request
     )
 
+
+def send_confirmations(count: int) -> None:
     # short confirmation, avoids reflecting user input
-    send_message("Thanks we saved your response")
+    for _ in range(count):
+        _CONFIRM_EXECUTOR.submit(send_message, "Thanks we saved your response").add_done_callback(_log_send_error)
+
+
+def _log_send_error(fut: Future) -> None:
+    e = fut.exception()
+    if e is not None:
+        print(f"[telegram_listener] confirmation failed: {e}", flush=True)
+
+
+def should_pause(polled_for: float, longpoll_timeout: float = LONGPOLL_TIMEOUT) -> bool:
+    # A long-poll that blocked server-side already paced the loop; only pause after
+    # polls that came back quickly. With no long-poll timeout every poll returns at
+    # once, so always pause or the loop would spin.
+    return longpoll_timeout <= 0 or polled_for < longpoll_timeout * 0.5
 
 
 def run_listener_forever() -> None:
@@ -168,12 +188,22 @@ def run_listener_forever() -> None:
     if not CHAT_ID:
         raise SystemExit("Missing TELEGRAM_CHAT_ID.")
 
+    # docker stop sends SIGTERM: exit via SystemExit so atexit hooks run (pending
+    # journal flush, and the executor waiting for in-flight confirmations)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
     influx = connect_influx()
     offset = load_offset()
+    saved_offset = offset
+    # Journal points written but not yet confirmed; carried over polls whose flush failed
+    unconfirmed = 0
 
     while True:
+        polled_for = 0.0
         try:
+            t0 = time.monotonic()
             updates = get_updates(offset)
+            polled_for = time.monotonic() - t0
             for upd in updates:
                 upd_id = upd.get("update_id")
                 if isinstance(upd_id, int):
@@ -182,14 +212,24 @@ def run_listener_forever() -> None:
                 extracted = extract_message(upd)
                 if extracted:
                     u_id, msg = extracted
-                    handle_message(influx, u_id, msg)
-
-            save_offset(offset)
+                    unconfirmed += handle_message(influx, u_id, msg)
+
+            # Journal writes are batched; persist them before the offset moves past them,
+            # then confirm exactly the points that reached Influx (a failed flush raises first
+            # and leaves its points pending, so they are confirmed after a later flush)
+            unconfirmed += flush_journal_entries(influx)
+            send_confirmations(unconfirmed)
+            unconfirmed = 0
+            # Idle polls return no updates; only touch the state file when the offset moved
+            if offset != saved_offset:
+                save_offset(offset)
+                saved_offset = offset
         except Exception as e:
             print(f"[telegram_listener] error: {e}", flush=True)
             time.sleep(5)
 
-        time.sleep(POLL_SLEEP)
+        if should_pause(polled_for):
+            time.sleep(POLL_SLEEP)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,101 @@
+"""
+Chunked intraday fetch against a stub Influx HTTP server, parsed by the real
+influxdb-python client (no mocked query()).
+
+Run from the repo root:
+  python -m unittest discover -s tests
+"""
+
+import json
+import sys
+import threading
+import unittest
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import msgpack
+from influxdb import InfluxDBClient
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from sleep_report.influx_fetch import fetch_sleep_intraday_range  # noqa: E402
+
+COLUMNS = ["time", "heartRate"]
+ROWS = [[f"2026-01-01T00:0{i}:00Z", 50 + i] for i in range(5)]
+
+
+def _chunk(rows, partial):
+    result = {"statement_id": 0, "series": [{"name": "SleepIntraday", "columns": COLUMNS, "values": rows}]}
+    if partial:
+        result["partial"] = True
+    return {"results": [result]}
+
+
+class _StubInflux(BaseHTTPRequestHandler):
+    # Rows per chunk the stub replies with; set per test
+    chunk_rows = 2
+    seen_accept: list = []
+
+    def do_GET(self):
+        accept = self.headers.get("Accept", "")
+        type(self).seen_accept.append(accept)
+        n = type(self).chunk_rows
+        parts = [ROWS[i:i + n] for i in range(0, len(ROWS), n)]
+        chunks = [_chunk(p, i < len(parts) - 1) for i, p in enumerate(parts)]
+
+        # Like influxd: msgpack when the client asks for it, newline-delimited JSON otherwise
+        if "msgpack" in accept:
+            body = b"".join(msgpack.packb(c) for c in chunks)
+            ctype = "application/x-msgpack"
+        else:
+            body = b"".join(json.dumps(c).encode("utf-8") + b"\n" for c in chunks)
+            ctype = "application/json"
+
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class FetchSleepIntradayRangeTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _StubInflux)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        _StubInflux.seen_accept = []
+        self.client = InfluxDBClient(host="127.0.0.1", port=self.server.server_address[1], database="GarminStats")
+
+    def _fetch(self):
+        start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        end = datetime(2026, 1, 2, tzinfo=timezone.utc)
+        return list(fetch_sleep_intraday_range(self.client, start, end))
+
+    def test_multiple_chunks(self):
+        _StubInflux.chunk_rows = 2
+        points = self._fetch()
+        self.assertEqual([(p["time"], p["heartRate"]) for p in points], [tuple(r) for r in ROWS])
+        self.assertEqual(_StubInflux.seen_accept, ["application/json"])
+
+    def test_single_chunk(self):
+        _StubInflux.chunk_rows = len(ROWS)
+        points = self._fetch()
+        self.assertEqual(len(points), len(ROWS))
+        self.assertEqual(points[0], {"time": ROWS[0][0], "heartRate": ROWS[0][1]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,32 @@
+"""
+Poll pacing in the Telegram listener.
+
+Run from the repo root:
+  python -m unittest discover -s tests
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from telegram_listener import should_pause  # noqa: E402
+
+
+class ShouldPauseTest(unittest.TestCase):
+    def test_zero_timeout_always_pauses(self):
+        self.assertTrue(should_pause(0.0, longpoll_timeout=0))
+        self.assertTrue(should_pause(0.3, longpoll_timeout=0))
+
+    def test_quick_return_pauses(self):
+        self.assertTrue(should_pause(1.0, longpoll_timeout=50))
+
+    def test_blocked_long_poll_does_not_pause(self):
+        self.assertFalse(should_pause(50.0, longpoll_timeout=50))
+
+
+if __name__ == "__main__":
+    unittest.main()